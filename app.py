@@ -5,9 +5,8 @@ Real-time system monitoring with interactive web interface
 
 import streamlit as st
 import psutil
-import pandas as pd
+import numpy as np
 import plotly.graph_objects as go
-import plotly.express as px
 from datetime import datetime
 import platform
 import time
@@ -41,44 +40,117 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
+BYTE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
+
+# Alert thresholds (%)
+CPU_ALERT_THRESHOLD = 80
+MEMORY_ALERT_THRESHOLD = 80
+DISK_ALERT_THRESHOLD = 90
+
+# Percentage-point change below which a chart keeps its previous values
+CHART_EPSILON = 0.2
+
+# History ring buffer layout
+DEFAULT_MAX_HISTORY = 50
+# One float64 matrix row per sample; float64 keeps byte counters exact
+HISTORY_COLUMNS = (
+    'cpu',
+    'memory',
+    'disk',
+    'network_sent',
+    'network_recv',
+    'disk_read',
+    'disk_write'
+)
+RATE_SERIES = (
+    ('network_sent', 'Net Sent', '#9467bd'),
+    ('network_recv', 'Net Recv', '#d62728'),
+    ('disk_read', 'Disk Read', '#17becf'),
+    ('disk_write', 'Disk Write', '#8c564b')
+)
+
+def allocate_history(size):
+    """Allocate empty fixed-size history buffers"""
+    return {
+        'timestamp': np.empty(size, dtype=np.int64),
+        'values': np.empty((size, len(HISTORY_COLUMNS)), dtype=np.float64)
+    }
+
 # Initialize session state
 if 'history' not in st.session_state:
-    st.session_state.history = {
-        'timestamp': [],
-        'cpu': [],
-        'memory': [],
-        'disk': [],
-        'network_sent': [],
-        'network_recv': []
-    }
+    st.session_state.history = allocate_history(DEFAULT_MAX_HISTORY)
+    st.session_state.history_head = 0
+    st.session_state.history_filled = 0
+if 'gauges' not in st.session_state:
+    st.session_state.gauges = {}
+    st.session_state.line_fig = None
+    st.session_state.rate_fig = None
+    st.session_state.core_fig = None
 if 'monitoring' not in st.session_state:
     st.session_state.monitoring = False
+if 'cpu_times' not in st.session_state:
+    # Previous (total, idle) CPU times; psutil.cpu_percent(interval=None) keeps its
+    # baseline per thread and Streamlit runs every rerun on a fresh thread
+    st.session_state.cpu_times = None
 
 def format_bytes(bytes_value):
     """Convert bytes to human readable format"""
-    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-        if bytes_value < 1024.0:
-            return f"{bytes_value:.2f} {unit}"
-        bytes_value /= 1024.0
-    return f"{bytes_value:.2f} PB"
+    # Each unit step is 10 bits, so the bit length picks the unit directly
+    unit_idx = min(max(0, (int(bytes_value).bit_length() - 1) // 10), len(BYTE_UNITS) - 1)
+    return f"{bytes_value / (1 << (unit_idx * 10)):.2f} {BYTE_UNITS[unit_idx]}"
+
+@st.cache_data
+def get_static_system_info():
+    """Get system information that does not change while the process runs"""
+    cpu_count = psutil.cpu_count()
+    return {
+        'hostname': socket.gethostname(),
+        'platform': platform.system(),
+        'boot_time': datetime.fromtimestamp(psutil.boot_time()),
+        'cpu_count': cpu_count,
+        'core_names': tuple(f"Core {i}" for i in range(cpu_count or 0))
+    }
 
 def get_system_info():
     """Get general system information"""
-    boot_time = datetime.fromtimestamp(psutil.boot_time())
+    static_info = get_static_system_info()
+    boot_time = static_info['boot_time']
     uptime = datetime.now() - boot_time
     return {
-        'hostname': socket.gethostname(),
-        'platform': platform.system(),
+        'hostname': static_info['hostname'],
+        'platform': static_info['platform'],
         'boot_time': boot_time.strftime("%Y-%m-%d %H:%M:%S"),
         'uptime': str(uptime).split('.')[0],
-        'cpu_count': psutil.cpu_count()
+        'cpu_count': static_info['cpu_count']
     }
 
+def split_cpu_times(times):
+    """Reduce a psutil cpu_times() sample to (total, idle) seconds"""
+    # Guest time is already included in user/nice; iowait counts as idle
+    total = sum(times) - getattr(times, 'guest', 0) - getattr(times, 'guest_nice', 0)
+    return total, times.idle + getattr(times, 'iowait', 0)
+
+def busy_percent(prev, current):
+    """CPU busy percentage between two (total, idle) samples"""
+    total = current[0] - prev[0]
+    if total <= 0:
+        return 0.0
+    busy = total - (current[1] - prev[1])
+    return round(min(max(busy / total * 100, 0.0), 100.0), 1)
+
 def get_cpu_metrics():
     """Get CPU usage metrics"""
-    cpu_percent = psutil.cpu_percent(interval=1)
+    current = [split_cpu_times(times)
+               for times in (psutil.cpu_times(), *psutil.cpu_times(percpu=True))]
+    prev = st.session_state.cpu_times
+    st.session_state.cpu_times = current
+    if prev is None or len(prev) != len(current):
+        # No earlier sample yet: report the average since boot
+        prev = [(0.0, 0.0)] * len(current)
+    
+    cpu_percent = busy_percent(prev[0], current[0])
     cpu_freq = psutil.cpu_freq()
-    per_cpu = psutil.cpu_percent(interval=1, percpu=True)
+    per_cpu = [busy_percent(p, c) for p, c in zip(prev[1:], current[1:])]
     
     return {
         'percent': cpu_percent,
@@ -128,27 +200,55 @@ def get_network_metrics():
 
 def check_alerts(cpu_percent, mem_percent, disk_percent):
     """Check for alert conditions"""
-    alerts = []
-    
-    if cpu_percent > 80:
-        alerts.append(f"⚠️ HIGH CPU USAGE: {cpu_percent:.1f}%")
-    
-    if mem_percent > 80:
-        alerts.append(f"⚠️ HIGH MEMORY USAGE: {mem_percent:.1f}%")
-    
-    if disk_percent > 90:
-        alerts.append(f"⚠️ HIGH DISK USAGE: {disk_percent:.1f}%")
-    
-    return alerts
+    return [message for triggered, message in (
+        (cpu_percent > CPU_ALERT_THRESHOLD, f"⚠️ HIGH CPU USAGE: {cpu_percent:.1f}%"),
+        (mem_percent > MEMORY_ALERT_THRESHOLD, f"⚠️ HIGH MEMORY USAGE: {mem_percent:.1f}%"),
+        (disk_percent > DISK_ALERT_THRESHOLD, f"⚠️ HIGH DISK USAGE: {disk_percent:.1f}%")
+    ) if triggered]
+
+def ordered_rows(history, head, filled):
+    """Return the raw time_ns() timestamps and value rows in chronological order"""
+    if filled < len(history['timestamp']):
+        return history['timestamp'][:filled], history['values'][:filled]
+    return np.roll(history['timestamp'], -head), np.roll(history['values'], -head, axis=0)
+
+def ordered_history(history, head, filled):
+    """Return history in chronological order as one column view per metric"""
+    timestamps, values = ordered_rows(history, head, filled)
+    # Shift to local wall-clock time once for the whole array; plotly formats the axis
+    local_ns = timestamps + time.localtime().tm_gmtoff * 1_000_000_000
+    ordered = {'timestamp': local_ns.astype('datetime64[ns]')}
+    for idx, key in enumerate(HISTORY_COLUMNS):
+        ordered[key] = values[:, idx]
+    return ordered
+
+def record_history(values, max_history):
+    """Write one sample into the history ring buffer"""
+    state = st.session_state
+    
+    # Reallocate when the history size changes, keeping the newest samples
+    if len(state.history['timestamp']) != max_history:
+        timestamps, rows = ordered_rows(state.history, state.history_head, state.history_filled)
+        keep = min(state.history_filled, max_history)
+        resized = allocate_history(max_history)
+        resized['timestamp'][:keep] = timestamps[len(timestamps) - keep:]
+        resized['values'][:keep] = rows[len(rows) - keep:]
+        state.history = resized
+        state.history_head = keep % max_history
+        state.history_filled = keep
+    
+    state.history['timestamp'][state.history_head] = values['timestamp']
+    state.history['values'][state.history_head] = [values[key] for key in HISTORY_COLUMNS]
+    state.history_head = (state.history_head + 1) % max_history
+    state.history_filled = min(state.history_filled + 1, max_history)
 
 def create_gauge_chart(value, title, color):
     """Create a gauge chart for metrics"""
     fig = go.Figure(go.Indicator(
-        mode="gauge+number+delta",
+        mode="gauge+number",
         value=value,
         domain={'x': [0, 1], 'y': [0, 1]},
         title={'text': title, 'font': {'size': 24}},
-        delta={'reference': 50},
         gauge={
             'axis': {'range': [None, 100], 'tickwidth': 1, 'tickcolor': "darkblue"},
             'bar': {'color': color},
@@ -173,29 +273,27 @@ def create_gauge_chart(value, title, color):
 
 def create_line_chart(history_data):
     """Create line chart for historical data"""
-    if not history_data['timestamp']:
+    if len(history_data['timestamp']) == 0:
         return None
     
-    df = pd.DataFrame(history_data)
-    
     fig = go.Figure()
     
     fig.add_trace(go.Scatter(
-        x=df['timestamp'], y=df['cpu'],
+        x=history_data['timestamp'], y=history_data['cpu'],
         mode='lines+markers',
         name='CPU %',
         line=dict(color='#1f77b4', width=2)
     ))
     
     fig.add_trace(go.Scatter(
-        x=df['timestamp'], y=df['memory'],
+        x=history_data['timestamp'], y=history_data['memory'],
         mode='lines+markers',
         name='Memory %',
         line=dict(color='#ff7f0e', width=2)
     ))
     
     fig.add_trace(go.Scatter(
-        x=df['timestamp'], y=df['disk'],
+        x=history_data['timestamp'], y=history_data['disk'],
         mode='lines+markers',
         name='Disk %',
         line=dict(color='#2ca02c', width=2)
@@ -204,6 +302,7 @@ def create_line_chart(history_data):
     fig.update_layout(
         title='Resource Usage Over Time',
         xaxis_title='Time',
+        xaxis_tickformat='%H:%M:%S',
         yaxis_title='Usage (%)',
         height=400,
         hovermode='x unified',
@@ -212,6 +311,113 @@ def create_line_chart(history_data):
     
     return fig
 
+def compute_rates(history_data, key):
+    """Convert a cumulative counter into per-second rates between samples"""
+    # Counters can reset (e.g. interface restart); treat that interval as idle
+    deltas = np.clip(np.diff(history_data[key]), 0, None)
+    elapsed = np.diff(history_data['timestamp']) / np.timedelta64(1, 's')
+    return deltas / elapsed
+
+def create_rate_chart(history_data):
+    """Create line chart of network and disk throughput"""
+    if len(history_data['timestamp']) < 2:
+        return None
+    
+    fig = go.Figure()
+    
+    for key, name, color in RATE_SERIES:
+        fig.add_trace(go.Scatter(
+            x=history_data['timestamp'][1:], y=compute_rates(history_data, key),
+            mode='lines+markers',
+            name=name,
+            line=dict(color=color, width=2)
+        ))
+    
+    fig.update_layout(
+        title='Network & Disk Throughput',
+        xaxis_title='Time',
+        xaxis_tickformat='%H:%M:%S',
+        yaxis_title='Bytes/s',
+        height=400,
+        hovermode='x unified'
+    )
+    
+    return fig
+
+def create_core_chart(per_cpu):
+    """Create bar chart of per-core CPU usage"""
+    core_names = get_static_system_info()['core_names']
+    if len(core_names) != len(per_cpu):
+        core_names = tuple(f"Core {i}" for i in range(len(per_cpu)))
+    
+    fig = go.Figure(go.Bar(
+        x=core_names,
+        y=per_cpu,
+        marker=dict(
+            color=per_cpu,
+            colorscale='Viridis',
+            cmin=0,
+            cmax=100,
+            showscale=True,
+            colorbar=dict(title='Usage (%)')
+        )
+    ))
+    
+    fig.update_layout(
+        title='CPU Usage by Core',
+        xaxis_title='Core',
+        yaxis_title='Usage (%)',
+        height=300
+    )
+    
+    return fig
+
+def update_gauge_chart(key, value, title, color):
+    """Return the session's gauge figure, updated in place with the current value"""
+    fig = st.session_state.gauges.get(key)
+    if fig is None:
+        fig = create_gauge_chart(value, title, color)
+        st.session_state.gauges[key] = fig
+    elif abs(value - fig.data[0].value) >= CHART_EPSILON:
+        fig.data[0].value = value
+    return fig
+
+def update_line_chart(history_data):
+    """Return the session's line chart, updated in place with the current history"""
+    fig = st.session_state.line_fig
+    if fig is None:
+        fig = create_line_chart(history_data)
+        st.session_state.line_fig = fig
+    else:
+        for trace, key in zip(fig.data, ('cpu', 'memory', 'disk')):
+            trace.x = history_data['timestamp']
+            trace.y = history_data[key]
+    return fig
+
+def update_rate_chart(history_data):
+    """Return the session's throughput chart, updated in place with the current history"""
+    fig = st.session_state.rate_fig
+    if fig is None:
+        fig = create_rate_chart(history_data)
+        st.session_state.rate_fig = fig
+    elif len(history_data['timestamp']) >= 2:
+        for trace, (key, _, _) in zip(fig.data, RATE_SERIES):
+            trace.x = history_data['timestamp'][1:]
+            trace.y = compute_rates(history_data, key)
+    return fig
+
+def update_core_chart(per_cpu):
+    """Return the session's per-core chart, updated in place with the current usage"""
+    fig = st.session_state.core_fig
+    if fig is None or len(per_cpu) != len(fig.data[0].y):
+        # New session or changed core count: rebuild so the core labels match
+        fig = create_core_chart(per_cpu)
+        st.session_state.core_fig = fig
+    elif np.max(np.abs(np.subtract(per_cpu, fig.data[0].y))) >= CHART_EPSILON:
+        fig.data[0].y = per_cpu
+        fig.data[0].marker.color = per_cpu
+    return fig
+
 # Main Dashboard
 def main():
     # Header
@@ -222,7 +428,7 @@ def main():
     with st.sidebar:
         st.header("⚙️ Settings")
         refresh_rate = st.slider("Refresh Rate (seconds)", 1, 10, 2)
-        max_history = st.slider("Max History Points", 10, 100, 50)
+        max_history = st.slider("Max History Points", 10, 100, DEFAULT_MAX_HISTORY)
         
         st.markdown("---")
         st.header("📊 System Info")
@@ -233,6 +439,15 @@ def main():
         st.info(f"**Uptime:** {sys_info['uptime']}")
         st.info(f"**Boot Time:** {sys_info['boot_time']}")
     
+    # Only the telemetry panels rerun on each refresh
+    st.fragment(run_every=refresh_rate)(render_telemetry)(max_history)
+    
+    # Auto-refresh
+    st.markdown("---")
+    st.info(f"🔄 Auto-refreshing every {refresh_rate} seconds...")
+
+def render_telemetry(max_history):
+    """Render the live metric, chart and statistics panels"""
     # Get current metrics
     cpu = get_cpu_metrics()
     memory = get_memory_metrics()
@@ -288,44 +503,53 @@ def main():
     
     with gauge_col1:
         st.plotly_chart(
-            create_gauge_chart(cpu['percent'], "CPU", "#1f77b4"),
-            use_container_width=True
+            update_gauge_chart('cpu', cpu['percent'], "CPU", "#1f77b4"),
+            use_container_width=True,
+            key="cpu_gauge"
         )
     
     with gauge_col2:
         st.plotly_chart(
-            create_gauge_chart(memory['percent'], "Memory", "#ff7f0e"),
-            use_container_width=True
+            update_gauge_chart('memory', memory['percent'], "Memory", "#ff7f0e"),
+            use_container_width=True,
+            key="memory_gauge"
         )
     
     with gauge_col3:
         st.plotly_chart(
-            create_gauge_chart(disk['percent'], "Disk", "#2ca02c"),
-            use_container_width=True
+            update_gauge_chart('disk', disk['percent'], "Disk", "#2ca02c"),
+            use_container_width=True,
+            key="disk_gauge"
         )
     
     # Update history
-    current_time = datetime.now().strftime("%H:%M:%S")
-    st.session_state.history['timestamp'].append(current_time)
-    st.session_state.history['cpu'].append(cpu['percent'])
-    st.session_state.history['memory'].append(memory['percent'])
-    st.session_state.history['disk'].append(disk['percent'])
-    st.session_state.history['network_sent'].append(network['bytes_sent'])
-    st.session_state.history['network_recv'].append(network['bytes_recv'])
-    
-    # Keep only recent history
-    for key in st.session_state.history:
-        if len(st.session_state.history[key]) > max_history:
-            st.session_state.history[key] = st.session_state.history[key][-max_history:]
+    record_history({
+        'timestamp': time.time_ns(),
+        'cpu': cpu['percent'],
+        'memory': memory['percent'],
+        'disk': disk['percent'],
+        'network_sent': network['bytes_sent'],
+        'network_recv': network['bytes_recv'],
+        'disk_read': disk['read_bytes'],
+        'disk_write': disk['write_bytes']
+    }, max_history)
     
     # Historical Chart
     st.markdown("---")
     st.markdown("### 📈 Historical Performance")
     
-    if st.session_state.history['timestamp']:
-        line_chart = create_line_chart(st.session_state.history)
-        if line_chart:
-            st.plotly_chart(line_chart, use_container_width=True)
+    if st.session_state.history_filled:
+        history_data = ordered_history(
+            st.session_state.history,
+            st.session_state.history_head,
+            st.session_state.history_filled
+        )
+        line_chart = update_line_chart(history_data)
+        if line_chart is not None:
+            st.plotly_chart(line_chart, use_container_width=True, key="history_chart")
+        rate_chart = update_rate_chart(history_data)
+        if rate_chart is not None:
+            st.plotly_chart(rate_chart, use_container_width=True, key="rate_chart")
     else:
         st.info("Collecting data... Chart will appear after first refresh.")
     
@@ -337,52 +561,34 @@ def main():
     
     with detail_col1:
         st.markdown("#### 💾 Memory Details")
-        mem_df = pd.DataFrame({
-            'Metric': ['Total', 'Used', 'Available', 'Swap Total', 'Swap Used'],
-            'Value': [
-                format_bytes(memory['total']),
-                format_bytes(memory['used']),
-                format_bytes(memory['available']),
-                format_bytes(memory['swap_total']),
-                format_bytes(memory['swap_used'])
-            ]
-        })
-        st.dataframe(mem_df, use_container_width=True, hide_index=True)
+        st.table([
+            {'Metric': 'Total', 'Value': format_bytes(memory['total'])},
+            {'Metric': 'Used', 'Value': format_bytes(memory['used'])},
+            {'Metric': 'Available', 'Value': format_bytes(memory['available'])},
+            {'Metric': 'Swap Total', 'Value': format_bytes(memory['swap_total'])},
+            {'Metric': 'Swap Used', 'Value': format_bytes(memory['swap_used'])}
+        ])
     
     with detail_col2:
         st.markdown("#### 💿 Disk Details")
-        disk_df = pd.DataFrame({
-            'Metric': ['Total', 'Used', 'Free', 'Read', 'Write'],
-            'Value': [
-                format_bytes(disk['total']),
-                format_bytes(disk['used']),
-                format_bytes(disk['free']),
-                format_bytes(disk['read_bytes']),
-                format_bytes(disk['write_bytes'])
-            ]
-        })
-        st.dataframe(disk_df, use_container_width=True, hide_index=True)
+        st.table([
+            {'Metric': 'Total', 'Value': format_bytes(disk['total'])},
+            {'Metric': 'Used', 'Value': format_bytes(disk['used'])},
+            {'Metric': 'Free', 'Value': format_bytes(disk['free'])},
+            {'Metric': 'Read', 'Value': format_bytes(disk['read_bytes'])},
+            {'Metric': 'Write', 'Value': format_bytes(disk['write_bytes'])}
+        ])
     
     # Per-CPU Usage
     if cpu['per_cpu']:
         st.markdown("---")
         st.markdown("### 🔧 Per-Core CPU Usage")
         
-        cpu_df = pd.DataFrame({
-            'Core': [f"Core {i}" for i in range(len(cpu['per_cpu']))],
-            'Usage (%)': cpu['per_cpu']
-        })
-        
-        fig = px.bar(
-            cpu_df,
-            x='Core',
-            y='Usage (%)',
-            color='Usage (%)',
-            color_continuous_scale='Viridis',
-            title='CPU Usage by Core'
+        st.plotly_chart(
+            update_core_chart(cpu['per_cpu']),
+            use_container_width=True,
+            key="core_chart"
         )
-        fig.update_layout(height=300)
-        st.plotly_chart(fig, use_container_width=True)
     
     # Network Statistics
     st.markdown("---")
@@ -395,12 +601,6 @@ def main():
     
     with net_col2:
         st.metric("📥 Packets Received", f"{network['packets_recv']:,}")
-    
-    # Auto-refresh
-    st.markdown("---")
-    st.info(f"🔄 Auto-refreshing every {refresh_rate} seconds...")
-    time.sleep(refresh_rate)
-    st.rerun()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
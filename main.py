@@ -4,37 +4,214 @@ A comprehensive system monitoring tool that tracks CPU, Memory, Disk, and Networ
 """
 
 import psutil
+import numpy as np
+from numba import njit
 import time
-import json
+import orjson
 from datetime import datetime
 from collections import deque
 import threading
+import os
+import queue
 import socket
 import platform
 
+BYTE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
+
+# Alert thresholds (%)
+CPU_ALERT_THRESHOLD = 80
+MEMORY_ALERT_THRESHOLD = 80
+DISK_ALERT_THRESHOLD = 90
+
+# Background log writer batching limits
+LOG_BATCH_SIZE = 64
+LOG_FLUSH_INTERVAL = 1.0
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY
+
+# Enough for /proc/meminfo; /proc/stat adds one line per core
+PROC_READ_SIZE = 4096
+PROC_STAT_LINE_SIZE = 128
+
+# Invariant for the lifetime of the process
+_HOSTNAME = socket.gethostname()
+_PLATFORM = platform.system()
+_CPU_COUNT = psutil.cpu_count()
+_BOOT_TIME = datetime.fromtimestamp(psutil.boot_time())
+
+
+def _open_proc(path):
+    """Open a /proc file for repeated pread() calls, or None where unavailable"""
+    try:
+        return os.open(path, os.O_RDONLY)
+    except OSError:
+        return None
+
+
+def _split_cpu_times(times):
+    """Reduce a psutil cpu_times() sample to (total, idle) like /proc/stat parsing"""
+    total = sum(times) - getattr(times, 'guest', 0) - getattr(times, 'guest_nice', 0)
+    return total, times.idle + getattr(times, 'iowait', 0)
+
+
+def _format_timestamp(timestamp_ns):
+    """Format a time.time_ns() value as local 'YYYY-mm-dd HH:MM:SS'"""
+    return datetime.fromtimestamp(timestamp_ns / 1e9).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _busy_percent(prev, current):
+    """CPU busy percentage between two (total, idle) jiffy samples"""
+    total = current[0] - prev[0]
+    if total <= 0:
+        return 0.0
+    busy = total - (current[1] - prev[1])
+    return round(min(max(busy / total * 100, 0.0), 100.0), 1)
+
+
+# Explicit signatures compile at import (or load from cache) instead of on first call
+@njit('UniTuple(f8, 3)(f8[::1], i8)', cache=True, fastmath=True)
+def _summarize(arr, count):
+    """Return (mean, min, max) of the first count samples in one pass"""
+    total = 0.0
+    mn = arr[0]
+    mx = arr[0]
+    for i in range(count):
+        value = arr[i]
+        total += value
+        if value < mn:
+            mn = value
+        if value > mx:
+            mx = value
+    return total / count, mn, mx
+
+
 class TelemetryMonitor:
     def __init__(self, history_size=100):
         """Initialize the telemetry monitor with configurable history size"""
         self.history_size = history_size
-        self.cpu_history = deque(maxlen=history_size)
-        self.memory_history = deque(maxlen=history_size)
-        self.disk_history = deque(maxlen=history_size)
+        self.cpu_history = np.empty(history_size, dtype=np.float64)
+        self.memory_history = np.empty(history_size, dtype=np.float64)
+        self.disk_history = np.empty(history_size, dtype=np.float64)
+        self.history_head = 0
+        self.history_count = 0
         self.network_history = deque(maxlen=history_size)
         self.timestamps = deque(maxlen=history_size)
         self.monitoring = False
         self.monitor_thread = None
+        self.log_filename = 'telemetry_log.json'
+        self.log_queue = None
+        self.log_thread = None
+        
+        self._stat_size = PROC_READ_SIZE + PROC_STAT_LINE_SIZE * (_CPU_COUNT or 1)
+        self._meminfo_fd = None
+        self._stat_fd = None
+        # Previous CPU times; psutil.cpu_percent(interval=None) keeps its baseline per
+        # thread, so samples taken on the monitor thread would never see a primed one
+        self._last_cpu_times = None
+        self.open_proc_files()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop_monitoring()
+        return False
+    
+    def open_proc_files(self):
+        """Open the /proc descriptors that each sample reads with pread()"""
+        if self._meminfo_fd is None and self._stat_fd is None:
+            self._meminfo_fd = _open_proc('/proc/meminfo')
+            self._stat_fd = _open_proc('/proc/stat')
+            # Jiffies from /proc/stat and psutil's seconds don't mix; start a new baseline
+            self._last_cpu_times = None
+    
+    def close(self):
+        """Close the /proc descriptors; getters fall back to psutil until reopened"""
+        for fd in (self._meminfo_fd, self._stat_fd):
+            if fd is not None:
+                os.close(fd)
+        self._meminfo_fd = None
+        self._stat_fd = None
+        # psutil reports seconds rather than jiffies, so restart the CPU baseline
+        self._last_cpu_times = None
+    
+    def _read_proc_stat_lines(self):
+        """Read /proc/stat, growing the buffer until every cpu line is complete"""
+        while True:
+            data = os.pread(self._stat_fd, self._stat_size, 0)
+            lines = data.split(b'\n')
+            if len(data) < self._stat_size:
+                return lines
+            # The buffer filled up, so the last line may have been cut short
+            lines.pop()
+            if any(not line.startswith(b'cpu') for line in lines):
+                return lines
+            self._stat_size *= 2
+    
+    def _read_cpu_times(self):
+        """Read (total, idle) CPU times for the aggregate and each core"""
+        if self._stat_fd is None:
+            return [_split_cpu_times(times)
+                    for times in (psutil.cpu_times(), *psutil.cpu_times(percpu=True))]
         
+        times = []
+        for line in self._read_proc_stat_lines():
+            if not line.startswith(b'cpu'):
+                break
+            values = [int(value) for value in line.split()[1:]]
+            # Guest time is already included in user/nice; iowait counts as idle
+            times.append((sum(values) - sum(values[8:10]), sum(values[3:5])))
+        return times
+    
+    def _read_cpu_percent(self):
+        """Get overall and per-core CPU percentages since the previous read"""
+        current = self._read_cpu_times()
+        prev = self._last_cpu_times
+        self._last_cpu_times = current
+        if prev is None or len(prev) != len(current):
+            # No earlier sample yet: report the average since boot
+            prev = [(0, 0)] * len(current)
+        return (_busy_percent(prev[0], current[0]),
+                [_busy_percent(p, c) for p, c in zip(prev[1:], current[1:])])
+    
+    def _read_meminfo(self):
+        """Parse /proc/meminfo into a dict of byte values"""
+        fields = {}
+        for line in os.pread(self._meminfo_fd, PROC_READ_SIZE, 0).split(b'\n'):
+            key, _, value = line.partition(b':')
+            if value:
+                fields[key] = int(value.split()[0]) * 1024
+        return fields
+    
     def get_cpu_metrics(self):
         """Get CPU usage metrics"""
+        freq = psutil.cpu_freq()
+        percent, per_cpu = self._read_cpu_percent()
         return {
-            'percent': psutil.cpu_percent(interval=1),
-            'count': psutil.cpu_count(),
-            'per_cpu': psutil.cpu_percent(interval=1, percpu=True),
-            'freq': psutil.cpu_freq()._asdict() if psutil.cpu_freq() else None
+            'percent': percent,
+            'count': _CPU_COUNT,
+            'per_cpu': per_cpu,
+            'freq': freq._asdict() if freq else None
         }
     
     def get_memory_metrics(self):
         """Get memory usage metrics"""
+        if self._meminfo_fd is not None:
+            fields = self._read_meminfo()
+            if b'MemAvailable' in fields:
+                total = fields[b'MemTotal']
+                available = fields[b'MemAvailable']
+                swap_total = fields.get(b'SwapTotal', 0)
+                swap_used = swap_total - fields.get(b'SwapFree', 0)
+                return {
+                    'total': total,
+                    'available': available,
+                    'used': total - available,
+                    'percent': round((total - available) / total * 100, 1),
+                    'swap_total': swap_total,
+                    'swap_used': swap_used,
+                    'swap_percent': round(swap_used / swap_total * 100, 1) if swap_total else 0.0
+                }
+        
         mem = psutil.virtual_memory()
         swap = psutil.swap_memory()
         return {
@@ -74,17 +251,16 @@ class TelemetryMonitor:
     
     def get_system_info(self):
         """Get general system information"""
-        boot_time = datetime.fromtimestamp(psutil.boot_time())
         return {
-            'hostname': socket.gethostname(),
-            'platform': platform.system(),
-            'boot_time': boot_time.strftime("%Y-%m-%d %H:%M:%S"),
-            'uptime': str(datetime.now() - boot_time).split('.')[0]
+            'hostname': _HOSTNAME,
+            'platform': _PLATFORM,
+            'boot_time': _BOOT_TIME.strftime("%Y-%m-%d %H:%M:%S"),
+            'uptime': str(datetime.now() - _BOOT_TIME).split('.')[0]
         }
     
     def collect_metrics(self):
         """Collect all metrics at once"""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        timestamp = time.time_ns()
         
         cpu = self.get_cpu_metrics()
         memory = self.get_memory_metrics()
@@ -92,9 +268,11 @@ class TelemetryMonitor:
         network = self.get_network_metrics()
         
         self.timestamps.append(timestamp)
-        self.cpu_history.append(cpu['percent'])
-        self.memory_history.append(memory['percent'])
-        self.disk_history.append(disk['percent'])
+        self.cpu_history[self.history_head] = cpu['percent']
+        self.memory_history[self.history_head] = memory['percent']
+        self.disk_history[self.history_head] = disk['percent']
+        self.history_head = (self.history_head + 1) % self.history_size
+        self.history_count = min(self.history_count + 1, self.history_size)
         self.network_history.append({
             'sent': network['bytes_sent'],
             'recv': network['bytes_recv']
@@ -110,16 +288,14 @@ class TelemetryMonitor:
     
     def format_bytes(self, bytes_value):
         """Convert bytes to human readable format"""
-        for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-            if bytes_value < 1024.0:
-                return f"{bytes_value:.2f} {unit}"
-            bytes_value /= 1024.0
-        return f"{bytes_value:.2f} PB"
+        # Each unit step is 10 bits, so the bit length picks the unit directly
+        unit_idx = min(max(0, (int(bytes_value).bit_length() - 1) // 10), len(BYTE_UNITS) - 1)
+        return f"{bytes_value / (1 << (unit_idx * 10)):.2f} {BYTE_UNITS[unit_idx]}"
     
     def display_metrics(self, metrics):
         """Display metrics in a formatted way"""
         print("\n" + "="*60)
-        print(f"System Telemetry - {metrics['timestamp']}")
+        print(f"System Telemetry - {_format_timestamp(metrics['timestamp'])}")
         print("="*60)
         
         # CPU Information
@@ -151,16 +327,14 @@ class TelemetryMonitor:
     
     def check_alerts(self, metrics):
         """Check for alert conditions"""
-        alerts = []
-        
-        if metrics['cpu']['percent'] > 80:
-            alerts.append(f"⚠️  HIGH CPU USAGE: {metrics['cpu']['percent']:.1f}%")
-        
-        if metrics['memory']['percent'] > 80:
-            alerts.append(f"⚠️  HIGH MEMORY USAGE: {metrics['memory']['percent']:.1f}%")
-        
-        if metrics['disk']['percent'] > 90:
-            alerts.append(f"⚠️  HIGH DISK USAGE: {metrics['disk']['percent']:.1f}%")
+        cpu_percent = metrics['cpu']['percent']
+        mem_percent = metrics['memory']['percent']
+        disk_percent = metrics['disk']['percent']
+        alerts = [message for triggered, message in (
+            (cpu_percent > CPU_ALERT_THRESHOLD, f"⚠️  HIGH CPU USAGE: {cpu_percent:.1f}%"),
+            (mem_percent > MEMORY_ALERT_THRESHOLD, f"⚠️  HIGH MEMORY USAGE: {mem_percent:.1f}%"),
+            (disk_percent > DISK_ALERT_THRESHOLD, f"⚠️  HIGH DISK USAGE: {disk_percent:.1f}%")
+        ) if triggered]
         
         if alerts:
             print("\n" + "="*60)
@@ -169,20 +343,91 @@ class TelemetryMonitor:
                 print(f"  {alert}")
             print("="*60)
     
+    def get_alert_mask(self):
+        """Flag every stored sample that crossed any alert threshold"""
+        count = self.history_count
+        return ((self.cpu_history[:count] > CPU_ALERT_THRESHOLD)
+                | (self.memory_history[:count] > MEMORY_ALERT_THRESHOLD)
+                | (self.disk_history[:count] > DISK_ALERT_THRESHOLD))
+    
     def save_to_json(self, metrics, filename='telemetry_log.json'):
         """Save metrics to JSON file"""
         try:
-            with open(filename, 'a') as f:
-                json.dump(metrics, f)
-                f.write('\n')
+            # The log keeps its "YYYY-mm-dd HH:MM:SS" timestamps
+            record = dict(metrics, timestamp=_format_timestamp(metrics['timestamp']))
+            entry = orjson.dumps(record, option=ORJSON_OPTIONS) + b'\n'
+            if self.log_queue is not None and filename == self.log_filename:
+                self.log_queue.put_nowait(entry)
+                return
+            
+            with open(filename, 'ab') as f:
+                f.write(entry)
         except Exception as e:
             print(f"Error saving to file: {e}")
     
+    def start_log_writer(self):
+        """Start the background thread that appends queued metrics to the log"""
+        if self.log_queue is None:
+            try:
+                log_file = open(self.log_filename, 'ab')
+            except Exception as e:
+                print(f"Error saving to file: {e}")
+                return
+            self.log_queue = queue.Queue()
+            self.log_thread = threading.Thread(
+                target=self.log_writer_loop,
+                args=(self.log_queue, log_file),
+                daemon=True
+            )
+            self.log_thread.start()
+    
+    def stop_log_writer(self):
+        """Flush pending metrics and stop the background log writer"""
+        if self.log_queue is not None:
+            self.log_queue.put(None)
+            self.log_thread.join()
+            self.log_queue = None
+            self.log_thread = None
+    
+    def log_writer_loop(self, log_queue, log_file):
+        """Write queued entries in batches of up to LOG_BATCH_SIZE or LOG_FLUSH_INTERVAL seconds"""
+        with log_file:
+            running = True
+            while running:
+                entry = log_queue.get()
+                if entry is None:
+                    break
+                
+                batch = [entry]
+                deadline = time.monotonic() + LOG_FLUSH_INTERVAL
+                while len(batch) < LOG_BATCH_SIZE:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        entry = log_queue.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+                    if entry is None:
+                        running = False
+                        break
+                    batch.append(entry)
+                
+                try:
+                    log_file.write(b''.join(batch))
+                    log_file.flush()
+                except Exception as e:
+                    print(f"Error saving to file: {e}")
+    
     def monitor_loop(self, interval=5, display=True, save=False):
         """Continuous monitoring loop"""
         print(f"\n🔍 Starting telemetry monitoring (interval: {interval}s)")
         print("Press Ctrl+C to stop\n")
         
+        self.open_proc_files()
+        if save:
+            self.start_log_writer()
+        
         try:
             while self.monitoring:
                 metrics = self.collect_metrics()
@@ -198,6 +443,9 @@ class TelemetryMonitor:
         except KeyboardInterrupt:
             print("\n\n✋ Monitoring stopped by user")
             self.monitoring = False
+        finally:
+            self.stop_log_writer()
+            self.close()
     
     def start_monitoring(self, interval=5, display=True, save=False):
         """Start monitoring in a separate thread"""
@@ -215,30 +463,21 @@ class TelemetryMonitor:
         self.monitoring = False
         if self.monitor_thread:
             self.monitor_thread.join()
+        self.close()
     
     def get_summary(self):
         """Get summary statistics of collected data"""
-        if len(self.cpu_history) == 0:
+        if self.history_count == 0:
             return "No data collected yet"
         
-        summary = {
-            'cpu': {
-                'avg': sum(self.cpu_history) / len(self.cpu_history),
-                'max': max(self.cpu_history),
-                'min': min(self.cpu_history)
-            },
-            'memory': {
-                'avg': sum(self.memory_history) / len(self.memory_history),
-                'max': max(self.memory_history),
-                'min': min(self.memory_history)
-            },
-            'disk': {
-                'avg': sum(self.disk_history) / len(self.disk_history),
-                'max': max(self.disk_history),
-                'min': min(self.disk_history)
-            },
-            'samples': len(self.cpu_history)
-        }
+        summary = {}
+        for key, history in (('cpu', self.cpu_history),
+                             ('memory', self.memory_history),
+                             ('disk', self.disk_history)):
+            avg, mn, mx = _summarize(history, self.history_count)
+            summary[key] = {'avg': float(avg), 'max': float(mx), 'min': float(mn)}
+        summary['samples'] = self.history_count
+        summary['alert_samples'] = int(np.count_nonzero(self.get_alert_mask()))
         return summary
 
 